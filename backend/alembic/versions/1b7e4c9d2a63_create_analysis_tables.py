@@ -0,0 +1,70 @@
+"""create meeting_analysis, emotion_timeline and topic_timeline tables
+
+Revision ID: 1b7e4c9d2a63
+Revises:
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "1b7e4c9d2a63"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "meeting_analysis",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("meeting_id", sa.String(length=255), nullable=False),
+        sa.Column("transcript", sa.Text(), nullable=False),
+        sa.Column("emotion_data", sa.JSON(), nullable=True),
+        sa.Column("topic_data", sa.JSON(), nullable=True),
+        sa.Column("summary_data", sa.JSON(), nullable=True),
+        sa.Column("engagement_data", sa.JSON(), nullable=True),
+        sa.Column("key_moments", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_meeting_analysis_id", "meeting_analysis", ["id"])
+    op.create_index("ix_meeting_analysis_meeting_id", "meeting_analysis", ["meeting_id"])
+
+    op.create_table(
+        "emotion_timeline",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("meeting_id", sa.String(length=255), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.Column("dominant_emotion", sa.String(length=50), nullable=False),
+        sa.Column("emotion_scores", sa.JSON(), nullable=False),
+        sa.Column("text_chunk", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_emotion_timeline_id", "emotion_timeline", ["id"])
+    op.create_index("ix_emotion_timeline_meeting_id", "emotion_timeline", ["meeting_id"])
+
+    op.create_table(
+        "topic_timeline",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("meeting_id", sa.String(length=255), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.Column("primary_topic", sa.String(length=255), nullable=False),
+        sa.Column("topic_scores", sa.JSON(), nullable=False),
+        sa.Column("drift_detected", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_topic_timeline_id", "topic_timeline", ["id"])
+    op.create_index("ix_topic_timeline_meeting_id", "topic_timeline", ["meeting_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("topic_timeline")
+    op.drop_table("emotion_timeline")
+    op.drop_table("meeting_analysis")
@@ -0,0 +1,37 @@
+"""add meeting_id, timestamp indexes to timeline tables
+
+Revision ID: 3f1c2b7a9d4e
+Revises: 1b7e4c9d2a63
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "3f1c2b7a9d4e"
+down_revision: Union[str, None] = "1b7e4c9d2a63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMELINE_TABLES = ("emotion_timeline", "topic_timeline")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TIMELINE_TABLES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_meeting_ts "
+                f"ON {table} (meeting_id, timestamp)"
+            )
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_meeting_id")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TIMELINE_TABLES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_meeting_id "
+                f"ON {table} (meeting_id)"
+            )
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_meeting_ts")
@@ -1,18 +1,24 @@
-from typing import Generator
+from typing import AsyncGenerator
 
 from fastapi import Depends, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.core.config import Settings, get_settings
 from app.db.session import SessionLocal
 from app.services.model_loader import ModelLoader
 
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    return SessionLocal
+
+
+def get_settings_dep() -> Settings:
+    return get_settings()
 
 
 def get_model_loader(request: Request) -> ModelLoader:
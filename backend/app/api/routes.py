@@ -1,10 +1,13 @@
 import logging
-from typing import List
+from typing import Any, Dict, List
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.api.deps import get_db, get_model_loader
+from app.api.deps import get_db, get_model_loader, get_session_factory, get_settings_dep
+from app.core.config import Settings
 from app.schemas.analysis import (
     AnalysisRequest,
     AnalysisResponse,
@@ -20,14 +23,19 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+
 @router.post("/analyze", response_model=AnalysisResponse)
 async def analyze_transcript(
     request: AnalysisRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     model_loader: ModelLoader = Depends(get_model_loader),
+    settings: Settings = Depends(get_settings_dep),
 ):
     try:
-        analysis_service = AnalysisService(model_loader, db)
+        analysis_service = AnalysisService(model_loader, db, settings)
         result = await analysis_service.analyze_transcript(
             transcript=request.transcript,
             meeting_id=request.meeting_id,
@@ -39,13 +47,43 @@ async def analyze_transcript(
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+@router.post("/analyze/stream")
+async def analyze_transcript_stream(
+    request: AnalysisRequest,
+    model_loader: ModelLoader = Depends(get_model_loader),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    settings: Settings = Depends(get_settings_dep),
+):
+    async def event_stream():
+        # get_db is torn down before a streaming body is sent, so the stream owns its session.
+        async with session_factory() as db:
+            analysis_service = AnalysisService(model_loader, db, settings)
+            try:
+                async for event, result in analysis_service.stream_transcript_analysis(
+                    transcript=request.transcript,
+                    meeting_id=request.meeting_id,
+                    timestamp=request.timestamp,
+                ):
+                    yield _format_sse(event, result.model_dump())
+            except Exception as e:
+                logger.error(f"Streaming analysis failed: {str(e)}")
+                yield _format_sse("error", {"detail": f"Analysis failed: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @router.post("/analyze/emotion", response_model=EmotionAnalysis)
 async def analyze_emotion(
     request: AnalysisRequest,
     model_loader: ModelLoader = Depends(get_model_loader),
+    settings: Settings = Depends(get_settings_dep),
 ):
     try:
-        analysis_service = AnalysisService(model_loader, None)
+        analysis_service = AnalysisService(model_loader, None, settings)
         emotions = await analysis_service.analyze_emotions(request.transcript)
         return emotions
     except Exception as e:
@@ -57,9 +95,10 @@ async def analyze_emotion(
 async def analyze_topic(
     request: AnalysisRequest,
     model_loader: ModelLoader = Depends(get_model_loader),
+    settings: Settings = Depends(get_settings_dep),
 ):
     try:
-        analysis_service = AnalysisService(model_loader, None)
+        analysis_service = AnalysisService(model_loader, None, settings)
         topics = await analysis_service.analyze_topics(request.transcript)
         return topics
     except Exception as e:
@@ -71,9 +110,10 @@ async def analyze_topic(
 async def generate_summary(
     request: AnalysisRequest,
     model_loader: ModelLoader = Depends(get_model_loader),
+    settings: Settings = Depends(get_settings_dep),
 ):
     try:
-        analysis_service = AnalysisService(model_loader, None)
+        analysis_service = AnalysisService(model_loader, None, settings)
         summary = await analysis_service.generate_summary(request.transcript)
         return summary
     except Exception as e:
@@ -4,6 +4,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from app.core.config import settings
+from app.services.inference_cache import inference_cache
 from app.services.model_loader import ModelLoader
 
 logger = logging.getLogger(__name__)
@@ -19,6 +20,8 @@ async def lifespan(app: FastAPI):
 
     try:
         await model_loader.load_all_models()
+        if settings.COMPILE_MODELS:
+            await model_loader.warmup()
         app.state.model_loader = model_loader
         logger.info("All models loaded successfully")
     except Exception as e:
@@ -30,3 +33,4 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down application")
     if hasattr(app.state, "model_loader"):
         app.state.model_loader.cleanup()
+    await inference_cache.close()
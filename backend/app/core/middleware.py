@@ -0,0 +1,27 @@
+from typing import Iterable
+
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """GZip responses except on excluded paths, e.g. Server-Sent Events.
+
+    A gzip stream only flushes in blocks, so compressed events would reach the client late.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        excluded_paths: Iterable[str] = (),
+        minimum_size: int = 500,
+        compresslevel: int = 9,
+    ) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.excluded_paths = frozenset(excluded_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -1,14 +1,55 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import Any, Dict
+from uuid import uuid4
+
+import orjson
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
+
+def get_async_database_url(database_url: str) -> str:
+    for sync_scheme in ("postgresql+psycopg2://", "postgresql://"):
+        if database_url.startswith(sync_scheme):
+            return "postgresql+asyncpg://" + database_url[len(sync_scheme) :]
+    return database_url
+
+
+def orjson_serializer(value: Any) -> str:
+    return orjson.dumps(value).decode()
+
+
+def unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def get_pool_options() -> Dict[str, Any]:
+    if settings.DB_USE_PGBOUNCER:
+        # PgBouncer owns the pool. In transaction mode consecutive statements can land on
+        # different server connections, so no statement cache may be reused and prepared
+        # statement names must be unique rather than numbered per client connection.
+        return {
+            "poolclass": NullPool,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": unique_statement_name,
+            },
+        }
+    return {
+        "pool_pre_ping": True,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
     echo=settings.DATABASE_ECHO,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    json_serializer=orjson_serializer,
+    json_deserializer=orjson.loads,
+    **get_pool_options(),
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
@@ -2,10 +2,12 @@ import logging
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.routes import router as api_router
 from app.core.config import settings
 from app.core.events import lifespan
+from app.core.middleware import StreamingAwareGZipMiddleware
 
 logging.basicConfig(
     level=getattr(logging, settings.LOG_LEVEL),
@@ -18,6 +20,14 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     debug=settings.DEBUG,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+app.add_middleware(
+    StreamingAwareGZipMiddleware,
+    excluded_paths=[f"{settings.API_V1_PREFIX}/analyze/stream"],
+    minimum_size=1024,
+    compresslevel=5,
 )
 
 app.add_middleware(
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, DateTime, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -28,9 +28,10 @@ class MeetingAnalysis(Base):
 
 class EmotionTimeline(Base):
     __tablename__ = "emotion_timeline"
+    __table_args__ = (Index("ix_emotion_timeline_meeting_ts", "meeting_id", "timestamp"),)
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    meeting_id = Column(String(255), index=True, nullable=False)
+    meeting_id = Column(String(255), nullable=False)
     timestamp = Column(DateTime, nullable=False)
 
     dominant_emotion = Column(String(50), nullable=False)
@@ -45,9 +46,10 @@ class EmotionTimeline(Base):
 
 class TopicTimeline(Base):
     __tablename__ = "topic_timeline"
+    __table_args__ = (Index("ix_topic_timeline_meeting_ts", "meeting_id", "timestamp"),)
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    meeting_id = Column(String(255), index=True, nullable=False)
+    meeting_id = Column(String(255), nullable=False)
     timestamp = Column(DateTime, nullable=False)
 
     primary_topic = Column(String(255), nullable=False)
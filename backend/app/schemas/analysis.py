@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AnalysisRequest(BaseModel):
@@ -75,12 +75,11 @@ class AnalysisResponse(BaseModel):
 
 
 class AnalysisResult(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     meeting_id: str
     created_at: datetime
     emotion_data: Dict
     topic_data: Dict
     summary_data: Optional[Dict] = None
-
-    class Config:
-        from_attributes = True
@@ -1,9 +1,13 @@
+import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple
 
-from sqlalchemy.orm import Session
+import torch
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import Settings, get_settings
 from app.models.analysis import EmotionTimeline, MeetingAnalysis, TopicTimeline
 from app.schemas.analysis import (
     AnalysisResponse,
@@ -14,42 +18,113 @@ from app.schemas.analysis import (
     TopicAnalysis,
     TopicScore,
 )
+from app.services.inference_cache import inference_cache, make_cache_key
 from app.services.model_loader import ModelLoader
 from app.utils.preprocessing import PreprocessingUtils
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_TOPIC_LABELS = (
+    "project planning",
+    "technical discussion",
+    "business strategy",
+    "team management",
+    "product development",
+    "customer feedback",
+    "budget and finance",
+    "marketing",
+    "general discussion",
+)
+
+EMOTION_WINDOW_TOKENS = 512
+EMOTION_WINDOW_STRIDE = 32
+
+
+def _run_inference(model_pipeline: Any, *args: Any, **kwargs: Any) -> Any:
+    # Grad mode is thread-local, so this has to wrap the call inside the worker thread.
+    with torch.inference_mode():
+        return model_pipeline(*args, **kwargs)
+
+
+def _classify_emotion_windows(
+    emotion_pipeline: Any, text: str, batch_size: int = 16
+) -> torch.Tensor:
+    tokenizer = emotion_pipeline.tokenizer
+    model = emotion_pipeline.model
+
+    # One fast-tokenizer pass splits the text into overlapping model-sized windows,
+    # so nothing is truncated and the pipeline doesn't re-tokenize each chunk.
+    encoded = tokenizer(
+        text,
+        truncation=True,
+        max_length=min(tokenizer.model_max_length, EMOTION_WINDOW_TOKENS),
+        stride=EMOTION_WINDOW_STRIDE,
+        return_overflowing_tokens=True,
+        padding=True,
+        return_tensors="pt",
+    )
+    encoded.pop("overflow_to_sample_mapping", None)
+
+    multi_label = (
+        model.config.problem_type == "multi_label_classification" or model.config.num_labels == 1
+    )
+
+    window_scores = []
+    with torch.inference_mode():
+        for start in range(0, len(encoded["input_ids"]), batch_size):
+            batch = {k: v[start : start + batch_size].to(model.device) for k, v in encoded.items()}
+            logits = model(**batch).logits.float()
+            window_scores.append(logits.sigmoid() if multi_label else logits.softmax(dim=-1))
+    return torch.cat(window_scores).cpu()
+
+
+def _score_emotions(emotion_pipeline: Any, text: str, batch_size: int = 16) -> List[Dict]:
+    # Average the [windows x labels] score matrix and rank labels by their mean score.
+    averaged = _classify_emotion_windows(emotion_pipeline, text, batch_size).mean(dim=0)
+    id2label = emotion_pipeline.model.config.id2label
+    order = torch.argsort(averaged, descending=True, stable=True)
+    scores = averaged.tolist()
+    return [{"label": id2label[i], "score": scores[i]} for i in order.tolist()]
+
 
 class AnalysisService:
-    def __init__(self, model_loader: ModelLoader, db: Optional[Session] = None):
+    def __init__(
+        self,
+        model_loader: ModelLoader,
+        db: Optional[AsyncSession] = None,
+        settings: Optional[Settings] = None,
+    ):
         self.model_loader = model_loader
         self.db = db
+        self.settings = settings or get_settings()
         self.preprocessing = PreprocessingUtils()
 
-    async def analyze_emotions(self, text: str) -> EmotionAnalysis:
+    async def analyze_emotions(
+        self, text: str, timestamp: Optional[datetime] = None
+    ) -> EmotionAnalysis:
         try:
-            chunks = self.preprocessing.chunk_text(text, max_length=512)
             emotion_pipeline = self.model_loader.get_emotion_pipeline()
 
-            all_emotions = []
-            for chunk in chunks:
-                if not chunk.strip():
-                    continue
-                result = emotion_pipeline(chunk)
-                all_emotions.extend(result[0])
-
-            aggregated_emotions = self._aggregate_emotions(all_emotions)
-            dominant_emotion = max(aggregated_emotions, key=lambda x: x["score"])
+            aggregated_emotions = await inference_cache.get_or_compute(
+                make_cache_key("emotion_scores", self.settings.EMOTION_MODEL_NAME, text),
+                lambda: asyncio.to_thread(
+                    _score_emotions,
+                    emotion_pipeline,
+                    text,
+                    self.settings.INFERENCE_BATCH_SIZE,
+                ),
+            )
 
             emotion_scores = [
-                EmotionScore(label=e["label"], score=e["score"]) for e in aggregated_emotions[:5]
+                EmotionScore.model_construct(label=e["label"], score=e["score"])
+                for e in aggregated_emotions[:5]
             ]
 
             return EmotionAnalysis(
                 text=text,
                 emotions=emotion_scores,
-                dominant_emotion=dominant_emotion["label"],
-                timestamp=datetime.utcnow(),
+                dominant_emotion=aggregated_emotions[0]["label"],
+                timestamp=timestamp or datetime.utcnow(),
             )
 
         except Exception as e:
@@ -61,25 +136,22 @@ class AnalysisService:
     ) -> TopicAnalysis:
         try:
             if candidate_labels is None:
-                candidate_labels = [
-                    "project planning",
-                    "technical discussion",
-                    "business strategy",
-                    "team management",
-                    "product development",
-                    "customer feedback",
-                    "budget and finance",
-                    "marketing",
-                    "general discussion",
-                ]
+                candidate_labels = list(DEFAULT_TOPIC_LABELS)
 
             topic_pipeline = self.model_loader.get_topic_pipeline()
             cleaned_text = self.preprocessing.clean_text(text)
 
-            result = topic_pipeline(cleaned_text, candidate_labels)
+            result = await inference_cache.get_or_compute(
+                make_cache_key(
+                    "topic", self.settings.TOPIC_MODEL_NAME, cleaned_text, *candidate_labels
+                ),
+                lambda: asyncio.to_thread(
+                    _run_inference, topic_pipeline, cleaned_text, candidate_labels
+                ),
+            )
 
             topic_scores = [
-                TopicScore(topic=label, score=score)
+                TopicScore.model_construct(topic=label, score=score)
                 for label, score in zip(result["labels"], result["scores"])
             ]
 
@@ -101,8 +173,16 @@ class AnalysisService:
             max_length = min(len(cleaned_text.split()), 150)
             min_length = min(max_length // 2, 30)
 
-            result = summary_pipeline(
-                cleaned_text, max_length=max_length, min_length=min_length, do_sample=False
+            result = await inference_cache.get_or_compute(
+                make_cache_key("summary", self.settings.SUMMARY_MODEL_NAME, cleaned_text),
+                lambda: asyncio.to_thread(
+                    _run_inference,
+                    summary_pipeline,
+                    cleaned_text,
+                    max_length=max_length,
+                    min_length=min_length,
+                    do_sample=False,
+                ),
             )
 
             summary_text = result[0]["summary_text"]
@@ -129,102 +209,141 @@ class AnalysisService:
         self, transcript: str, meeting_id: str, timestamp: Optional[datetime] = None
     ) -> AnalysisResponse:
         try:
-            timestamp = timestamp or datetime.utcnow()
-
-            emotion_analysis = await self.analyze_emotions(transcript)
-            topic_analysis = await self.analyze_topics(transcript)
+            now = datetime.utcnow()
+            timestamp = timestamp or now
 
-            summary = None
-            if len(transcript.split()) > 50:
-                summary = await self.generate_summary(transcript)
+            analyses = self._start_analyses(transcript, now)
+            results = dict(zip(analyses, await asyncio.gather(*analyses.values())))
 
-            if self.db:
-                self._save_to_database(
-                    meeting_id, transcript, emotion_analysis, topic_analysis, summary
-                )
-
-            return AnalysisResponse(
-                meeting_id=meeting_id,
-                timestamp=timestamp,
-                emotion_analysis=emotion_analysis,
-                topic_analysis=topic_analysis,
-                summary=summary,
-                metadata={
-                    "transcript_length": len(transcript),
-                    "word_count": len(transcript.split()),
-                },
-            )
+            return await self._finish_analysis(transcript, meeting_id, timestamp, now, results)
 
         except Exception as e:
             logger.error(f"Full transcript analysis failed: {e}")
             raise
 
-    def _aggregate_emotions(self, emotions: List[Dict]) -> List[Dict]:
-        emotion_totals = {}
-        for emotion in emotions:
-            label = emotion["label"]
-            score = emotion["score"]
-            if label in emotion_totals:
-                emotion_totals[label] += score
-            else:
-                emotion_totals[label] = score
+    async def stream_transcript_analysis(
+        self, transcript: str, meeting_id: str, timestamp: Optional[datetime] = None
+    ) -> AsyncIterator[Tuple[str, BaseModel]]:
+        now = datetime.utcnow()
+        timestamp = timestamp or now
+
+        tasks = {
+            asyncio.ensure_future(analysis): name
+            for name, analysis in self._start_analyses(transcript, now).items()
+        }
+        pending = set(tasks)
+        results = {}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = tasks[task]
+                    results[name] = task.result()
+                    yield name, results[name]
+        except Exception as e:
+            logger.error(f"Streaming transcript analysis failed: {e}")
+            raise
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Sibling failures are superseded by the one raised; mark them as retrieved.
+                    task.exception()
+
+        yield "complete", await self._finish_analysis(
+            transcript, meeting_id, timestamp, now, results
+        )
+
+    def _start_analyses(self, transcript: str, now: datetime) -> Dict[str, Awaitable[BaseModel]]:
+        analyses = {
+            "emotion": self.analyze_emotions(transcript, timestamp=now),
+            "topic": self.analyze_topics(transcript),
+        }
+        if len(transcript.split()) > 50:
+            analyses["summary"] = self.generate_summary(transcript)
+        return analyses
+
+    async def _finish_analysis(
+        self,
+        transcript: str,
+        meeting_id: str,
+        timestamp: datetime,
+        now: datetime,
+        results: Dict[str, BaseModel],
+    ) -> AnalysisResponse:
+        emotion_analysis = results["emotion"]
+        topic_analysis = results["topic"]
+        summary = results.get("summary")
 
-        count = len(emotions)
-        averaged = [
-            {"label": label, "score": total / count} for label, total in emotion_totals.items()
-        ]
+        if self.db:
+            await self._save_to_database(
+                meeting_id, transcript, emotion_analysis, topic_analysis, summary, now
+            )
 
-        return sorted(averaged, key=lambda x: x["score"], reverse=True)
+        return AnalysisResponse(
+            meeting_id=meeting_id,
+            timestamp=timestamp,
+            emotion_analysis=emotion_analysis,
+            topic_analysis=topic_analysis,
+            summary=summary,
+            metadata={
+                "transcript_length": len(transcript),
+                "word_count": len(transcript.split()),
+            },
+        )
 
     def _extract_key_points(self, summary: str) -> List[str]:
         sentences = [s.strip() for s in summary.split(".") if s.strip()]
         return sentences[:3]
 
-    def _save_to_database(
+    async def _save_to_database(
         self,
         meeting_id: str,
         transcript: str,
         emotion_analysis: EmotionAnalysis,
         topic_analysis: TopicAnalysis,
         summary: Optional[MeetingSummary],
+        now: datetime,
     ):
         try:
+            emotion_scores = [e.model_dump() for e in emotion_analysis.emotions]
+            topic_scores = [t.model_dump() for t in topic_analysis.topics]
+
             analysis_record = MeetingAnalysis(
                 meeting_id=meeting_id,
                 transcript=transcript,
                 emotion_data={
                     "dominant_emotion": emotion_analysis.dominant_emotion,
-                    "emotions": [e.dict() for e in emotion_analysis.emotions],
+                    "emotions": emotion_scores,
                 },
                 topic_data={
                     "primary_topic": topic_analysis.primary_topic,
-                    "topics": [t.dict() for t in topic_analysis.topics],
+                    "topics": topic_scores,
                 },
-                summary_data=summary.dict() if summary else None,
+                summary_data=summary.model_dump() if summary else None,
             )
-            self.db.add(analysis_record)
 
             emotion_timeline = EmotionTimeline(
                 meeting_id=meeting_id,
-                timestamp=datetime.utcnow(),
+                timestamp=now,
                 dominant_emotion=emotion_analysis.dominant_emotion,
-                emotion_scores=[e.dict() for e in emotion_analysis.emotions],
+                emotion_scores=emotion_scores,
                 text_chunk=transcript[:500],
             )
-            self.db.add(emotion_timeline)
 
             topic_timeline = TopicTimeline(
                 meeting_id=meeting_id,
-                timestamp=datetime.utcnow(),
+                timestamp=now,
                 primary_topic=topic_analysis.primary_topic,
-                topic_scores=[t.dict() for t in topic_analysis.topics],
+                topic_scores=topic_scores,
             )
-            self.db.add(topic_timeline)
 
-            self.db.commit()
+            self.db.add_all([analysis_record, emotion_timeline, topic_timeline])
+            await self.db.commit()
             logger.info(f"Saved analysis for meeting {meeting_id}")
 
         except Exception as e:
             logger.error(f"Failed to save to database: {e}")
-            self.db.rollback()
+            await self.db.rollback()
             raise
@@ -0,0 +1,89 @@
+import hashlib
+import inspect
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import orjson
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(namespace: str, *parts: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return f"{namespace}:{digest.hexdigest()}"
+
+
+class InferenceCache:
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        ttl_seconds: int = 86400,
+        maxsize: int = 1024,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._local: "OrderedDict[str, bytes]" = OrderedDict()
+        self._redis = redis.from_url(redis_url) if redis_url else None
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        cached = await self._get(key)
+        if cached is not None:
+            return orjson.loads(cached)
+
+        value = compute()
+        if inspect.isawaitable(value):
+            value = await value
+
+        await self._set(key, orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY))
+        return value
+
+    async def _get(self, key: str) -> Optional[bytes]:
+        if self._redis is not None:
+            try:
+                return await self._redis.get(key)
+            except Exception as e:
+                logger.warning(f"Inference cache read failed: {e}")
+                return None
+
+        cached = self._local.get(key)
+        if cached is not None:
+            self._local.move_to_end(key)
+        return cached
+
+    async def _set(self, key: str, value: bytes):
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, value, ex=self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Inference cache write failed: {e}")
+            return
+
+        if self.maxsize <= 0:
+            return
+        self._local[key] = value
+        self._local.move_to_end(key)
+        while len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+
+    def clear(self):
+        # Only the in-process LRU; a shared Redis cache is left to its TTL.
+        self._local.clear()
+
+    async def close(self):
+        self.clear()
+        if self._redis is not None:
+            await self._redis.close()
+
+
+inference_cache = InferenceCache(
+    redis_url=settings.REDIS_URL,
+    ttl_seconds=settings.INFERENCE_CACHE_TTL_SECONDS,
+    maxsize=settings.INFERENCE_CACHE_MAXSIZE,
+)
@@ -1,14 +1,17 @@
 import logging
+import math
 import os
 from typing import Any, Dict, Optional
 
 import torch
-from transformers import pipeline
+from transformers import AutoTokenizer, pipeline
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+WARMUP_TEXT = "Thanks everyone for joining, let's get started with the project update."
+
 
 class ModelLoader:
     def __init__(self):
@@ -16,6 +19,11 @@ class ModelLoader:
         self.topic_pipeline: Optional[Any] = None
         self.summary_pipeline: Optional[Any] = None
         self.device = self._get_device()
+        if self.device == "cuda":
+            self._enable_tf32()
+        else:
+            self._configure_cpu_threads()
+        self.torch_dtype = self._get_torch_dtype()
         self._ensure_cache_dir()
 
     def _get_device(self) -> str:
@@ -23,11 +31,43 @@ class ModelLoader:
             return "cuda" if torch.cuda.is_available() else "cpu"
         return settings.MODEL_DEVICE
 
+    def _enable_tf32(self):
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+        torch.set_float32_matmul_precision("high")
+
+    def _configure_cpu_threads(self):
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+
+        # Split the cores between uvicorn workers so they don't oversubscribe the CPU.
+        num_threads = settings.TORCH_NUM_THREADS or max(
+            1, (os.cpu_count() or 1) // max(1, settings.WEB_CONCURRENCY)
+        )
+        torch.set_num_threads(num_threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Only settable once per process, before any inter-op work has started.
+            pass
+        logger.info(f"Using {num_threads} intra-op threads for CPU inference")
+
+    def _get_torch_dtype(self) -> Optional[torch.dtype]:
+        if self.device != "cuda":
+            return None
+
+        dtype = getattr(torch, settings.MODEL_DTYPE, None)
+        if not isinstance(dtype, torch.dtype):
+            raise ValueError(f"Unsupported MODEL_DTYPE: {settings.MODEL_DTYPE}")
+        if dtype == torch.bfloat16 and not torch.cuda.is_bf16_supported():
+            logger.warning("bfloat16 is not supported on this GPU, using float16")
+            return torch.float16
+        return dtype
+
     def _ensure_cache_dir(self):
         os.makedirs(settings.HUGGINGFACE_CACHE_DIR, exist_ok=True)
 
     async def load_all_models(self):
-        logger.info(f"Loading models on device: {self.device}")
+        logger.info(f"Loading models on device: {self.device} (dtype: {self.torch_dtype})")
 
         os.environ["TRANSFORMERS_CACHE"] = settings.HUGGINGFACE_CACHE_DIR
         os.environ["HF_HOME"] = settings.HUGGINGFACE_CACHE_DIR
@@ -38,16 +78,26 @@ class ModelLoader:
                 "text-classification",
                 model=settings.EMOTION_MODEL_NAME,
                 device=self.device,
+                torch_dtype=self.torch_dtype,
                 top_k=None,
+                batch_size=settings.INFERENCE_BATCH_SIZE,
             )
+            self._validate_emotion_precision()
+            self._prepare_pipeline(self.emotion_pipeline)
             logger.info("Emotion model loaded successfully")
 
             logger.info("Loading topic classification model...")
-            self.topic_pipeline = pipeline(
-                "zero-shot-classification",
-                model=settings.TOPIC_MODEL_NAME,
-                device=self.device,
-            )
+            if settings.TOPIC_MODEL_BACKEND == "onnx":
+                self.topic_pipeline = self._load_onnx_topic_pipeline()
+            else:
+                self.topic_pipeline = pipeline(
+                    "zero-shot-classification",
+                    model=settings.TOPIC_MODEL_NAME,
+                    device=self.device,
+                    torch_dtype=self.torch_dtype,
+                    batch_size=settings.INFERENCE_BATCH_SIZE,
+                )
+                self._prepare_pipeline(self.topic_pipeline)
             logger.info("Topic model loaded successfully")
 
             logger.info("Loading summarization model...")
@@ -55,13 +105,94 @@ class ModelLoader:
                 "summarization",
                 model=settings.SUMMARY_MODEL_NAME,
                 device=self.device,
+                torch_dtype=self.torch_dtype,
             )
+            self._prepare_pipeline(self.summary_pipeline)
             logger.info("Summary model loaded successfully")
 
         except Exception as e:
             logger.error(f"Error loading models: {e}")
             raise
 
+    def _load_onnx_topic_pipeline(self):
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+        except ImportError as e:
+            raise RuntimeError(
+                "TOPIC_MODEL_BACKEND=onnx requires optimum[onnxruntime] to be installed"
+            ) from e
+
+        provider = "CUDAExecutionProvider" if self.device == "cuda" else "CPUExecutionProvider"
+        export_dir = os.path.join(
+            settings.HUGGINGFACE_CACHE_DIR, "onnx", settings.TOPIC_MODEL_NAME.replace("/", "--")
+        )
+
+        if os.path.isdir(export_dir):
+            model = ORTModelForSequenceClassification.from_pretrained(export_dir, provider=provider)
+            tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        else:
+            logger.info(f"Exporting {settings.TOPIC_MODEL_NAME} to ONNX...")
+            model = ORTModelForSequenceClassification.from_pretrained(
+                settings.TOPIC_MODEL_NAME, export=True, provider=provider
+            )
+            tokenizer = AutoTokenizer.from_pretrained(settings.TOPIC_MODEL_NAME)
+            model.save_pretrained(export_dir)
+            tokenizer.save_pretrained(export_dir)
+
+        return pipeline(
+            "zero-shot-classification",
+            model=model,
+            tokenizer=tokenizer,
+            batch_size=settings.INFERENCE_BATCH_SIZE,
+        )
+
+    def _validate_emotion_precision(self):
+        if self.torch_dtype in (None, torch.float32):
+            return
+
+        scores = self.emotion_pipeline(WARMUP_TEXT)[0]
+        if any(math.isnan(e["score"]) for e in scores):
+            logger.warning(
+                f"Emotion model produced NaN scores in {self.torch_dtype}, using float32"
+            )
+            self.emotion_pipeline.model.float()
+
+    def _prepare_pipeline(self, model_pipeline: Any):
+        model_pipeline.model.eval()
+        self._compile_pipeline(model_pipeline)
+
+    def _compile_pipeline(self, model_pipeline: Any):
+        if not settings.COMPILE_MODELS:
+            return
+        if not hasattr(torch, "compile"):
+            logger.warning("torch.compile requires PyTorch 2.0+, running models eagerly")
+            return
+        # Compiling forward in place keeps the pipeline's model class intact, so
+        # generate() on the summarization model goes through the compiled graph too.
+        model = model_pipeline.model
+        model.forward = torch.compile(model.forward, mode="reduce-overhead", dynamic=True)
+
+    def _restore_eager(self, model_pipeline: Any):
+        model = model_pipeline.model
+        if "forward" in vars(model):
+            del model.forward
+
+    async def warmup(self):
+        warmup_calls = [
+            ("emotion", self.emotion_pipeline, (WARMUP_TEXT,), {}),
+            ("topic", self.topic_pipeline, (WARMUP_TEXT, ["general discussion"]), {}),
+            ("summary", self.summary_pipeline, (WARMUP_TEXT,), {"max_length": 20, "min_length": 5}),
+        ]
+
+        for name, model_pipeline, args, kwargs in warmup_calls:
+            logger.info(f"Warming up {name} model...")
+            try:
+                model_pipeline(*args, **kwargs)
+            except Exception as e:
+                logger.warning(f"Compiled {name} model failed warm-up, falling back to eager: {e}")
+                self._restore_eager(model_pipeline)
+                model_pipeline(*args, **kwargs)
+
     def get_emotion_pipeline(self):
         if self.emotion_pipeline is None:
             raise RuntimeError("Emotion model not loaded")
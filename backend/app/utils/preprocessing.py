@@ -1,49 +1,51 @@
 import re
-from typing import List
+from collections import defaultdict
+from typing import Dict, Iterator, List, Tuple
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+SPEAKER_PATTERN = re.compile(r"^([A-Z][a-z]+(?:[^\S\n][A-Z][a-z]+)*):", re.MULTILINE)
 
 
 class PreprocessingUtils:
     @staticmethod
     def clean_text(text: str) -> str:
-        text = re.sub(r"\s+", " ", text)
-        text = text.strip()
-        return text
+        return WHITESPACE_PATTERN.sub(" ", text).strip()
 
     @staticmethod
-    def chunk_text(text: str, max_length: int = 512, overlap: int = 50) -> List[str]:
+    def iter_chunks(text: str, max_length: int = 512, overlap: int = 50) -> Iterator[str]:
         words = text.split()
-        chunks = []
 
         for i in range(0, len(words), max_length - overlap):
-            chunk = " ".join(words[i : i + max_length])
-            chunks.append(chunk)
+            yield " ".join(words[i : i + max_length])
 
             if i + max_length >= len(words):
                 break
 
-        return chunks
+    @staticmethod
+    def chunk_text(text: str, max_length: int = 512, overlap: int = 50) -> List[str]:
+        return list(PreprocessingUtils.iter_chunks(text, max_length, overlap))
+
+    @staticmethod
+    def _parse_speakers(text: str) -> Tuple[List[str], Dict[str, str]]:
+        # One pass over speaker tags; each turn runs until the next tag, so continuation
+        # lines come from slicing between matches.
+        matches = list(SPEAKER_PATTERN.finditer(text))
+        speaker_texts: Dict[str, List[str]] = defaultdict(list)
+
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            lines = [line.strip() for line in text[match.end() : end].split("\n")]
+            content = [line for line in lines if line]
+            if content:
+                speaker_texts[match.group(1)].extend(content)
+
+        speakers = list(dict.fromkeys(match.group(1) for match in matches))
+        return speakers, {speaker: " ".join(texts) for speaker, texts in speaker_texts.items()}
 
     @staticmethod
     def extract_speakers(text: str) -> List[str]:
-        speaker_pattern = r"^([A-Z][a-z]+(?:\s[A-Z][a-z]+)*):"
-        speakers = re.findall(speaker_pattern, text, re.MULTILINE)
-        return list(set(speakers))
+        return PreprocessingUtils._parse_speakers(text)[0]
 
     @staticmethod
     def split_by_speaker(text: str) -> dict:
-        lines = text.split("\n")
-        speaker_texts = {}
-
-        current_speaker = None
-        for line in lines:
-            match = re.match(r"^([A-Z][a-z]+(?:\s[A-Z][a-z]+)*):\s*(.+)", line)
-            if match:
-                current_speaker = match.group(1)
-                content = match.group(2)
-                if current_speaker not in speaker_texts:
-                    speaker_texts[current_speaker] = []
-                speaker_texts[current_speaker].append(content)
-            elif current_speaker and line.strip():
-                speaker_texts[current_speaker].append(line.strip())
-
-        return {speaker: " ".join(texts) for speaker, texts in speaker_texts.items()}
+        return PreprocessingUtils._parse_speakers(text)[1]
@@ -1,3 +1,4 @@
+import asyncio
 import sys
 from pathlib import Path
 
@@ -7,11 +8,13 @@ from app.db.base import Base
 from app.db.session import engine
 
 
-def init_db():
+async def init_db():
     print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
     print("Database tables created successfully!")
 
 
 if __name__ == "__main__":
-    init_db()
+    asyncio.run(init_db())
@@ -0,0 +1,49 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.api.deps import get_model_loader
+from app.main import app
+from app.models.analysis import EmotionTimeline, MeetingAnalysis
+from app.services import analysis_service
+
+
+class StubModelLoader:
+    def get_emotion_pipeline(self):
+        return None
+
+    def get_topic_pipeline(self):
+        return lambda text, labels: {"labels": list(labels), "scores": [1.0] + [0.0] * 8}
+
+    def get_summary_pipeline(self):
+        return lambda text, **kwargs: [{"summary_text": "The team planned the launch."}]
+
+
+@pytest.fixture
+def stub_client(db_overrides, monkeypatch):
+    monkeypatch.setattr(
+        analysis_service,
+        "_score_emotions",
+        lambda pipe, text, batch_size: [{"label": "joy", "score": 0.9}],
+    )
+    app.dependency_overrides[get_model_loader] = StubModelLoader
+    # Not entered as a context manager, so the model-loading lifespan never runs.
+    return TestClient(app)
+
+
+async def test_analyze_writes_into_the_test_transaction(stub_client: TestClient, db_session):
+    response = stub_client.post(
+        "/api/v1/analyze",
+        json={"meeting_id": "meeting-1", "transcript": "We planned the launch. " * 5},
+    )
+
+    assert response.status_code == 200
+    analysis = (await db_session.execute(select(MeetingAnalysis))).scalar_one()
+    assert analysis.meeting_id == "meeting-1"
+    timeline = (await db_session.execute(select(EmotionTimeline))).scalar_one()
+    assert timeline.dominant_emotion == "joy"
+
+
+async def test_analyze_writes_are_rolled_back_between_tests(stub_client: TestClient, db_session):
+    count = select(func.count()).select_from(MeetingAnalysis)
+    assert (await db_session.execute(count)).scalar() == 0
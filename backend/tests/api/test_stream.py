@@ -0,0 +1,36 @@
+from contextlib import asynccontextmanager
+
+import orjson
+
+from app.api.routes import analyze_transcript_stream
+from app.core.config import get_settings
+from app.schemas.analysis import AnalysisRequest
+
+
+class UnavailableModelLoader:
+    def get_emotion_pipeline(self):
+        raise RuntimeError("models not loaded")
+
+    get_topic_pipeline = get_emotion_pipeline
+    get_summary_pipeline = get_emotion_pipeline
+
+
+@asynccontextmanager
+async def no_db_session():
+    yield None
+
+
+async def test_analyze_stream_reports_failures_as_error_event():
+    request = AnalysisRequest(transcript="We planned the launch.", meeting_id="meeting-1")
+
+    response = await analyze_transcript_stream(
+        request, UnavailableModelLoader(), no_db_session, get_settings()
+    )
+    body = "".join([chunk async for chunk in response.body_iterator])
+
+    assert response.media_type == "text/event-stream"
+    event, data = body.strip().split("\n")
+    assert event == "event: error"
+    assert orjson.loads(data.removeprefix("data: ")) == {
+        "detail": "Analysis failed: models not loaded"
+    }
@@ -1,30 +1,110 @@
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
+from app.api.deps import get_db, get_session_factory
 from app.db.base import Base
-from app.db.session import SessionLocal
 from app.main import app
+from app.services.inference_cache import inference_cache
+
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite://"
+
+# Sessions join the per-test transaction through a SAVEPOINT, so service code can commit freely.
+TestingSessionLocal = async_sessionmaker(
+    autoflush=False, expire_on_commit=False, join_transaction_mode="create_savepoint"
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_inference_cache():
+    # The cache is module-global; start every test cold so results don't depend on test order.
+    inference_cache.clear()
+    yield
+    inference_cache.clear()
+
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+def _enable_sqlite_savepoints(engine):
+    # pysqlite defers BEGIN on its own, which breaks SAVEPOINT; let SQLAlchemy emit it instead.
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+async def _create_schema(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+@pytest.fixture(scope="session")
+def _engine():
+    engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    _enable_sqlite_savepoints(engine)
+    asyncio.run(_create_schema(engine))
+    yield engine
+    asyncio.run(engine.dispose())
 
 
 @pytest.fixture(scope="function")
-def db_session():
-    Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
+async def _connection(_engine):
+    # One outer transaction per test; every session below joins it through a SAVEPOINT.
+    async with _engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            yield connection
+        finally:
+            await transaction.rollback()
+
+
+@pytest.fixture(scope="function")
+async def db_session(_connection):
+    db = TestingSessionLocal(bind=_connection)
     try:
         yield db
     finally:
-        db.close()
-        Base.metadata.drop_all(bind=engine)
+        await db.close()
 
 
-@pytest.fixture(scope="module")
-def client():
+# Session-scoped so the lifespan (model loading) runs once for the whole run.
+@pytest.fixture(scope="session")
+def _test_client():
     with TestClient(app) as c:
         yield c
+
+
+@pytest.fixture(scope="function")
+def db_overrides(_connection):
+    # Routes get sessions on the per-test connection; needs no lifespan, so no models load.
+    session_factory = async_sessionmaker(
+        bind=_connection,
+        autoflush=False,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+
+    async def _override_get_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    try:
+        yield session_factory
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+def client(_test_client, db_overrides):
+    return _test_client
@@ -0,0 +1,200 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+import torch
+from sqlalchemy import select
+from tokenizers import Tokenizer
+from tokenizers.models import WordLevel
+from tokenizers.pre_tokenizers import Whitespace
+from transformers import (
+    BertConfig,
+    BertForSequenceClassification,
+    PreTrainedTokenizerFast,
+    pipeline,
+)
+
+from app.core.config import Settings
+from app.models.analysis import EmotionTimeline, MeetingAnalysis, TopicTimeline
+from app.schemas.analysis import EmotionAnalysis, EmotionScore, TopicAnalysis, TopicScore
+from app.services import analysis_service
+from app.services.analysis_service import (
+    AnalysisService,
+    _classify_emotion_windows,
+    _score_emotions,
+)
+
+WORDS = ["we", "planned", "the", "product", "launch", "for", "next", "quarter."]
+
+
+@pytest.fixture(scope="module")
+def emotion_pipeline():
+    vocab = {token: i for i, token in enumerate(["[PAD]", "[UNK]", *WORDS])}
+    backend = Tokenizer(WordLevel(vocab, unk_token="[UNK]"))
+    backend.pre_tokenizer = Whitespace()
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=backend, model_max_length=64, pad_token="[PAD]", unk_token="[UNK]"
+    )
+
+    config = BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=8,
+        num_hidden_layers=1,
+        num_attention_heads=1,
+        intermediate_size=8,
+        id2label={0: "joy", 1: "neutral"},
+        label2id={"joy": 0, "neutral": 1},
+        problem_type="multi_label_classification",
+    )
+    model = BertForSequenceClassification(config)
+    with torch.no_grad():
+        model.classifier.weight.zero_()
+        model.classifier.bias.copy_(torch.tensor([3.0, -3.0]))
+
+    return pipeline("text-classification", model=model, tokenizer=tokenizer, top_k=None)
+
+
+def test_classify_emotion_windows_covers_long_text(emotion_pipeline):
+    text = " ".join(WORDS * 40)
+
+    window_scores = _classify_emotion_windows(emotion_pipeline, text)
+
+    assert window_scores.shape[0] > 1
+    assert window_scores.shape[1] == 2
+    assert (window_scores[:, 0] > 0.9).all()
+    assert (window_scores[:, 1] < 0.1).all()
+
+
+def test_score_emotions_ranks_labels_by_mean_window_score(emotion_pipeline):
+    text = " ".join(WORDS * 40)
+
+    scores = _score_emotions(emotion_pipeline, text)
+
+    expected = _classify_emotion_windows(emotion_pipeline, text).mean(dim=0).tolist()
+    assert [e["label"] for e in scores] == ["joy", "neutral"]
+    assert [e["score"] for e in scores] == expected
+    assert all(isinstance(e["score"], float) for e in scores)
+
+
+class FakeModelLoader:
+    def __init__(self, emotion_pipeline):
+        self.emotion_pipeline = emotion_pipeline
+
+    def get_emotion_pipeline(self):
+        return self.emotion_pipeline
+
+    def get_topic_pipeline(self):
+        return lambda text, labels: {"labels": list(labels), "scores": [1.0] + [0.0] * 8}
+
+    def get_summary_pipeline(self):
+        return lambda text, **kwargs: [{"summary_text": "The team planned the launch."}]
+
+
+async def test_analyze_transcript_runs_all_analyses(emotion_pipeline):
+    service = AnalysisService(model_loader=FakeModelLoader(emotion_pipeline))
+    transcript = " ".join(["We planned the product launch for next quarter."] * 10)
+
+    result = await service.analyze_transcript(transcript, meeting_id="meeting-1")
+
+    assert result.emotion_analysis.dominant_emotion == "joy"
+    assert result.topic_analysis.primary_topic == "project planning"
+    assert result.summary.summary == "The team planned the launch."
+    assert result.metadata["word_count"] == 80
+
+
+async def test_stream_transcript_analysis_yields_each_result_then_complete(emotion_pipeline):
+    service = AnalysisService(model_loader=FakeModelLoader(emotion_pipeline))
+    transcript = " ".join(["We planned the launch date for the new product."] * 10)
+
+    events = [event async for event in service.stream_transcript_analysis(transcript, "meeting-1")]
+
+    names = [name for name, _ in events]
+    assert sorted(names[:3]) == ["emotion", "summary", "topic"]
+    assert names[3:] == ["complete"]
+    complete = events[-1][1]
+    assert complete.emotion_analysis == dict(events)["emotion"]
+    assert complete.summary.summary == "The team planned the launch."
+
+
+async def test_stream_transcript_analysis_cancels_pending_work_on_failure():
+    service = AnalysisService(model_loader=None)
+    cancelled = []
+
+    async def wait_forever(name):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(name)
+            raise
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("topic model unavailable")
+
+    service.analyze_emotions = lambda *args, **kwargs: wait_forever("emotion")
+    service.generate_summary = lambda *args, **kwargs: wait_forever("summary")
+    service.analyze_topics = fail
+    transcript = " ".join(["word"] * 60)
+
+    with pytest.raises(RuntimeError, match="topic model unavailable"):
+        async for _ in service.stream_transcript_analysis(transcript, "meeting-1"):
+            pass
+    await asyncio.sleep(0)
+
+    assert sorted(cancelled) == ["emotion", "summary"]
+
+
+async def test_analysis_service_uses_injected_settings(emotion_pipeline, monkeypatch):
+    calls = []
+
+    def score_emotions(pipe, text, batch_size):
+        calls.append(batch_size)
+        return [{"label": "joy", "score": 1.0}]
+
+    monkeypatch.setattr(analysis_service, "_score_emotions", score_emotions)
+    loader = FakeModelLoader(emotion_pipeline)
+    text = "Settings decide which cached emotion scores are reused."
+
+    first = AnalysisService(
+        loader, settings=Settings(EMOTION_MODEL_NAME="a", INFERENCE_BATCH_SIZE=2)
+    )
+    second = AnalysisService(
+        loader, settings=Settings(EMOTION_MODEL_NAME="b", INFERENCE_BATCH_SIZE=4)
+    )
+    await first.analyze_emotions(text)
+    await second.analyze_emotions(text)
+    await first.analyze_emotions(text)
+
+    assert calls == [2, 4]
+
+
+async def test_save_to_database_writes_analysis_and_timelines(db_session):
+    service = AnalysisService(model_loader=None, db=db_session)
+    emotion_analysis = EmotionAnalysis(
+        text="We planned the launch.",
+        emotions=[EmotionScore(label="joy", score=0.9)],
+        dominant_emotion="joy",
+        timestamp=datetime(2024, 1, 1),
+    )
+    topic_analysis = TopicAnalysis(
+        topics=[TopicScore(topic="project planning", score=0.8)],
+        primary_topic="project planning",
+    )
+
+    await service._save_to_database(
+        "meeting-1",
+        "We planned the launch.",
+        emotion_analysis,
+        topic_analysis,
+        None,
+        datetime(2024, 1, 1),
+    )
+
+    analysis = (await db_session.execute(select(MeetingAnalysis))).scalar_one()
+    assert analysis.emotion_data["dominant_emotion"] == "joy"
+    timeline = (await db_session.execute(select(EmotionTimeline))).scalar_one()
+    assert timeline.emotion_scores == [{"label": "joy", "score": 0.9}]
+    assert (await db_session.execute(select(TopicTimeline))).scalar_one().meeting_id == "meeting-1"
+
+
+async def test_db_session_rolls_back_between_tests(db_session):
+    assert (await db_session.execute(select(MeetingAnalysis))).first() is None
@@ -0,0 +1,45 @@
+from app.services.inference_cache import InferenceCache, make_cache_key
+
+
+def test_make_cache_key_is_stable_and_namespaced():
+    key = make_cache_key("emotion", "model", "hello")
+    assert key == make_cache_key("emotion", "model", "hello")
+    assert key.startswith("emotion:")
+    assert key != make_cache_key("emotion", "model", "hello!")
+    assert make_cache_key("topic", "ab", "c") != make_cache_key("topic", "a", "bc")
+
+
+async def test_get_or_compute_reuses_cached_result():
+    cache = InferenceCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [{"label": "joy", "score": 0.9}]
+
+    first = await cache.get_or_compute("emotion:abc", compute)
+    second = await cache.get_or_compute("emotion:abc", compute)
+
+    assert first == second == [{"label": "joy", "score": 0.9}]
+    assert len(calls) == 1
+
+
+async def test_local_cache_evicts_least_recently_used():
+    cache = InferenceCache(maxsize=2)
+
+    await cache.get_or_compute("a", lambda: 1)
+    await cache.get_or_compute("b", lambda: 2)
+    await cache.get_or_compute("a", lambda: 0)
+    await cache.get_or_compute("c", lambda: 3)
+
+    assert await cache.get_or_compute("a", lambda: -1) == 1
+    assert await cache.get_or_compute("b", lambda: -1) == -1
+
+
+async def test_clear_drops_local_entries():
+    cache = InferenceCache()
+    await cache.get_or_compute("a", lambda: 1)
+
+    cache.clear()
+
+    assert await cache.get_or_compute("a", lambda: 2) == 2
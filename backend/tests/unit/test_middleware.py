@@ -0,0 +1,38 @@
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.middleware import StreamingAwareGZipMiddleware
+
+
+def _make_client():
+    app = FastAPI()
+    app.add_middleware(StreamingAwareGZipMiddleware, excluded_paths=["/stream"], minimum_size=10)
+
+    async def events():
+        for i in range(3):
+            yield f"event: tick\ndata: {i}\n\n"
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/text")
+    async def text():
+        return PlainTextResponse("x" * 100)
+
+    return TestClient(app, headers={"Accept-Encoding": "gzip"})
+
+
+def test_excluded_path_is_not_compressed():
+    response = _make_client().get("/stream")
+
+    assert "content-encoding" not in response.headers
+    assert response.text.count("event: tick") == 3
+
+
+def test_other_paths_are_still_compressed():
+    response = _make_client().get("/text")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == "x" * 100
@@ -16,6 +16,17 @@ def test_chunk_text():
     assert all(len(chunk.split()) <= 100 for chunk in chunks)
 
 
+def test_chunk_text_overlaps_and_covers_all_words():
+    utils = PreprocessingUtils()
+    words = [f"w{i}" for i in range(250)]
+    chunks = utils.chunk_text("  ".join(words), max_length=100, overlap=10)
+    assert [chunk.split()[0] for chunk in chunks] == ["w0", "w90", "w180"]
+    assert chunks[0].split()[-1] == "w99"
+    assert chunks[-1].split()[-1] == "w249"
+    assert utils.chunk_text("   ") == []
+    assert next(utils.iter_chunks("  ".join(words), max_length=100, overlap=10)) == chunks[0]
+
+
 def test_extract_speakers():
     utils = PreprocessingUtils()
     text = """John Doe: Hello everyone
@@ -24,7 +35,7 @@ John Doe: How are you?"""
     speakers = utils.extract_speakers(text)
     assert "John Doe" in speakers
     assert "Jane Smith" in speakers
-    assert len(speakers) == 2
+    assert speakers == ["John Doe", "Jane Smith"]
 
 
 def test_split_by_speaker():
@@ -37,3 +48,19 @@ John Doe: How are you?"""
     assert "Jane Smith" in speaker_texts
     assert "Hello everyone" in speaker_texts["John Doe"]
     assert "Hi there" in speaker_texts["Jane Smith"]
+
+
+def test_split_by_speaker_joins_continuation_lines():
+    utils = PreprocessingUtils()
+    text = """Intro before anyone speaks
+John Doe: First point
+  and its continuation
+
+Jane Smith:
+Reply on the next line
+John Doe: Closing"""
+    assert utils.extract_speakers(text) == ["John Doe", "Jane Smith"]
+    assert utils.split_by_speaker(text) == {
+        "John Doe": "First point and its continuation Closing",
+        "Jane Smith": "Reply on the next line",
+    }
@@ -0,0 +1,18 @@
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.db.session import get_pool_options
+
+
+def test_pgbouncer_mode_disables_pooling_and_statement_caches(monkeypatch):
+    monkeypatch.setattr(settings, "DB_USE_PGBOUNCER", True)
+
+    options = get_pool_options()
+    connect_args = options["connect_args"]
+
+    assert options["poolclass"] is NullPool
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+    assert name_func().startswith("__asyncpg_")